@@ -0,0 +1,13 @@
+# app/celery_app.py
+# Celery app shared by the web tier and the worker. Kept free of model/processing imports so
+# gunicorn web workers can queue jobs without loading torch or ultralytics.
+from celery import Celery
+import config
+
+celery = Celery(__name__, broker=config.CELERY_BROKER_URL, backend=config.CELERY_RESULT_BACKEND)
+celery.conf.task_track_started = True # Report STARTED instead of PENDING while a video is being processed
+# The worker child loads and warms up the model before reporting ready (see app/tasks.py), which takes
+# far longer than Celery's default 4s; without this the pool keeps killing and respawning it
+celery.conf.worker_proc_alive_timeout = config.WORKER_STARTUP_TIMEOUT
+
+RUN_PROCESSING_TASK = 'road_signs.run_processing' # Registered in app/tasks.py (worker side only)
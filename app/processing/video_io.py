@@ -0,0 +1,174 @@
+# app/processing/video_io.py
+import logging
+from abc import ABC, abstractmethod
+from fractions import Fraction
+
+import cv2
+
+try:
+    import av # PyAV (FFmpeg bindings), optional - enables H.264 encode and NVDEC decode
+except ImportError:
+    av = None
+
+
+class VideoSource(ABC):
+    """
+    Frame reader interface implemented by the OpenCV and PyAV backends.
+    read() mirrors cv2.VideoCapture.read() and returns (ret, frame) with frame as a BGR numpy array.
+    Implementations set width, height, fps and frame_count when opened.
+    """
+    width = 0
+    height = 0
+    fps = 0.0
+    frame_count = 0
+
+    @abstractmethod
+    def read(self):
+        ...
+
+    @abstractmethod
+    def release(self):
+        ...
+
+
+class VideoSink(ABC):
+    """Frame writer interface implemented by the OpenCV and PyAV backends. Accepts BGR numpy arrays."""
+
+    @abstractmethod
+    def write(self, frame):
+        ...
+
+    @abstractmethod
+    def release(self):
+        ...
+
+
+class OpenCVVideoSource(VideoSource):
+    """CPU software decode through cv2.VideoCapture."""
+
+    def __init__(self, path: str):
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open video file: {path}")
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+    def read(self):
+        return self.cap.read()
+
+    def release(self):
+        self.cap.release()
+
+
+class PyAVVideoSource(VideoSource):
+    """FFmpeg decode through PyAV, using NVDEC (CUDA hwaccel) when requested."""
+
+    def __init__(self, path: str, use_cuda: bool = False):
+        hwaccel = None
+        if use_cuda:
+            from av.codec.hwaccel import HWAccel
+            hwaccel = HWAccel(device_type='cuda', allow_software_fallback=True)
+        self.container = av.open(path, hwaccel=hwaccel)
+        self.stream = self.container.streams.video[0]
+        self.stream.thread_type = 'AUTO' # Let FFmpeg use frame/slice threading for software fallback
+        self.width = self.stream.codec_context.width
+        self.height = self.stream.codec_context.height
+        self.fps = float(self.stream.average_rate or 0)
+        self.frame_count = self.stream.frames
+        self._frames = self.container.decode(self.stream)
+
+    def read(self):
+        try:
+            frame = next(self._frames)
+        except StopIteration: # Normal end of video; FFmpeg decode errors propagate to the reader thread
+            return False, None
+        return True, frame.to_ndarray(format='bgr24')
+
+    def release(self):
+        self.container.close()
+
+
+class OpenCVVideoSink(VideoSink):
+    """CPU software encode through cv2.VideoWriter ('mp4v')."""
+
+    def __init__(self, path: str, fps: float, size: tuple):
+        # Using 'mp4v' codec for MP4 output. Other options: 'XVID' for AVI
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        self.writer = cv2.VideoWriter(path, fourcc, fps, size)
+        if not self.writer.isOpened():
+            raise IOError(f"Cannot initialize video writer for: {path}")
+
+    def write(self, frame):
+        self.writer.write(frame)
+
+    def release(self):
+        self.writer.release()
+
+
+class PyAVVideoSink(VideoSink):
+    """FFmpeg encode through PyAV with the given codec and encoder options."""
+
+    def __init__(self, path: str, fps: float, size: tuple, codec: str, options: dict = None):
+        self.container = av.open(path, mode='w')
+        try:
+            # limit_denominator keeps NTSC rates like 29.97 as 30000/1001
+            self.stream = self.container.add_stream(codec, rate=Fraction(fps or 30).limit_denominator(1001))
+            self.stream.width, self.stream.height = size
+            self.stream.pix_fmt = 'yuv420p'
+            self.stream.options = options or {}
+            self.stream.codec_context.open() # Open now so a missing/unsupported encoder fails here, not mid-video
+        except Exception:
+            self.container.close()
+            raise
+
+    def write(self, frame):
+        video_frame = av.VideoFrame.from_ndarray(frame, format='bgr24')
+        for packet in self.stream.encode(video_frame):
+            self.container.mux(packet)
+
+    def release(self):
+        for packet in self.stream.encode(): # Flush frames still buffered in the encoder
+            self.container.mux(packet)
+        self.container.close()
+
+
+def open_video_source(path: str, use_cuda: bool = False) -> VideoSource:
+    """
+    Opens path for reading. On CUDA hosts with PyAV installed, decodes with NVDEC;
+    otherwise (or if that fails) falls back to OpenCV.
+    """
+    if use_cuda and av is not None:
+        try:
+            source = PyAVVideoSource(path, use_cuda=True)
+            logging.info("Using PyAV/FFmpeg decoder with CUDA hwaccel")
+            return source
+        except Exception as e:
+            logging.warning(f"Hardware decode unavailable, falling back to OpenCV: {e}")
+    return OpenCVVideoSource(path)
+
+
+# H.264 encoders tried in order. Fast presets cut encode CPU/GPU time a lot compared to OpenCV's 'mp4v';
+# a long GOP without B-frames keeps the encoder from buffering/reordering frames.
+NVENC_OPTIONS = {'preset': 'p1', 'tune': 'll', 'g': '250', 'bf': '0'}
+X264_OPTIONS = {'preset': 'ultrafast', 'tune': 'zerolatency', 'g': '250', 'bf': '0'}
+
+
+def open_video_sink(path: str, fps: float, size: tuple, use_cuda: bool = False) -> VideoSink:
+    """
+    Opens path for writing frames of the given (width, height). With PyAV installed, encodes H.264
+    with NVENC on CUDA hosts or libx264 (ultrafast) otherwise; falls back to OpenCV 'mp4v' if neither works.
+    """
+    if av is not None:
+        encoders = [('h264_nvenc', NVENC_OPTIONS)] if use_cuda else []
+        encoders.append(('libx264', X264_OPTIONS))
+        for codec, options in encoders:
+            try:
+                sink = PyAVVideoSink(path, fps, size, codec, options)
+                logging.info(f"Using PyAV/FFmpeg {codec} encoder")
+                return sink
+            except Exception as e:
+                logging.warning(f"{codec} encoder unavailable: {e}")
+        logging.warning("Falling back to OpenCV video writer")
+    return OpenCVVideoSink(path, fps, size)
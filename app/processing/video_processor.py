@@ -1,12 +1,260 @@
 # app/processing/video_processor.py
 import cv2
+import numpy as np
 from ultralytics import YOLO
 import logging # Use logging for better tracking
 import torch # Ensure torch is available
+import queue
+import threading
+from pathlib import Path
+from .video_io import open_video_source, open_video_sink
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def process_video(input_video_path: str, output_video_path: str, model_path: str):
+MODEL_IMGSZ = 640 # Input size the model was trained/exported with
+LOG_EVERY = 128 # Progress log interval in frames; a power of two so the check is a bit mask
+MAX_CONSECUTIVE_PREDICT_FAILURES = 3 # More failed batches in a row means a persistent error, not a glitch
+
+# Drawing settings, hoisted out of the per-box loop
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+FONT_SCALE = 0.6
+FONT_THICKNESS = 2
+BOX_COLOR = (0, 255, 0) # Green boxes and label backgrounds
+TEXT_COLOR = (0, 0, 0) # Black text
+
+def _read_frames(cap, read_q: queue.Queue, stop_event: threading.Event, errors: dict):
+    """
+    Reader stage: decodes frames from the capture into read_q. Always ends with a None sentinel;
+    a decode error is saved in errors['reader'] for the main thread to re-raise.
+    """
+    try:
+        while not stop_event.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                break
+            read_q.put(frame)
+    except Exception as e:
+        logging.error(f"Error reading video frames: {e}")
+        errors['reader'] = e
+    finally:
+        read_q.put(None) # The main thread drains read_q while we're alive, so this can't block forever
+
+
+def _write_frames(video_writer, write_q: queue.Queue, errors: dict):
+    """
+    Writer stage: encodes annotated frames from write_q until a None sentinel arrives.
+    An encode/disk error stops the thread and is saved in errors['writer'].
+    """
+    try:
+        while True:
+            frame = write_q.get()
+            if frame is None:
+                break
+            video_writer.write(frame)
+    except Exception as e:
+        logging.error(f"Error writing video frames: {e}")
+        errors['writer'] = e
+
+
+def _get_checked(q: queue.Queue, producer: threading.Thread, errors: dict):
+    """get() from a stage queue that raises instead of blocking forever if the producer thread has died."""
+    while True:
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            if not producer.is_alive() and q.empty():
+                raise errors.get(producer.name) or RuntimeError(f"Video {producer.name} thread stopped unexpectedly")
+
+
+def _put_checked(q: queue.Queue, item, consumer: threading.Thread, errors: dict):
+    """put() to a stage queue that raises instead of blocking forever if the consumer thread has died."""
+    while True:
+        if not consumer.is_alive():
+            raise errors.get(consumer.name) or RuntimeError(f"Video {consumer.name} thread stopped unexpectedly")
+        try:
+            q.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+
+
+def _label_entry(label: str) -> tuple:
+    """Returns (label, (text_width, text_height), baseline) for drawing "<label>: <score>" text."""
+    # Hershey digits all have the same advance width, so the size of "<label>: 0.87" doesn't depend
+    # on the score and can be measured once per class with a placeholder score
+    return (label, *cv2.getTextSize(f"{label}: 0.00", FONT, FONT_SCALE, FONT_THICKNESS))
+
+
+def _build_labels(class_names: dict) -> list:
+    """
+    Turns the model's {class_id: name} dict into a list of _label_entry() tuples, so per-box
+    lookups are a plain index and no text measuring happens while drawing.
+    """
+    num_classes = max(class_names) + 1 if class_names else 0
+    return [_label_entry(class_names.get(class_id, f"Class_{class_id}")) for class_id in range(num_classes)]
+
+
+def _detections_to_numpy(result):
+    """Returns a YOLO result's boxes as an (N, 6) [x1, y1, x2, y2, score, class_id] array, or None if empty."""
+    # Checking the length only reads the tensor shape, so frames without detections skip the
+    # device-to-host copy (and the stream sync it forces) entirely
+    if len(result.boxes) == 0:
+        return None
+    return result.boxes.data.cpu().numpy() # Single transfer of boxes, scores, classes as numpy array
+
+
+def _annotate_frame(frame, detections, labels: list, inv_scale: float = 1.0):
+    """
+    Draws bounding boxes and labels from _detections_to_numpy() directly onto frame and returns it.
+    labels comes from _build_labels().
+    Boxes are multiplied by inv_scale to map them from the downscaled model input back to the frame.
+    """
+    # Draw in place: the video source hands the reader a fresh array per frame and nothing else uses it afterwards
+    if detections is None:
+        return frame
+
+    # Scale and cast all boxes at once instead of per-box Python int() calls.
+    # tolist() yields plain Python ints/floats, which is what cv2's drawing functions expect.
+    boxes = (detections[:, :4] * inv_scale).astype(np.int32).tolist()
+    scores = detections[:, 4].tolist()
+    class_ids = detections[:, 5].astype(np.int32).tolist()
+    num_labels = len(labels)
+
+    for (x1, y1, x2, y2), score, class_id in zip(boxes, scores, class_ids):
+        # Get class name and its precomputed text size
+        if class_id < num_labels:
+            label, (text_width, text_height), baseline = labels[class_id]
+        else:
+            label, (text_width, text_height), baseline = _label_entry(f"Class_{class_id}")
+        label_with_score = "%s: %.2f" % (label, score)
+
+        # Draw bounding box
+        # You can customize color, thickness etc. at the top of this file
+        cv2.rectangle(frame, (x1, y1), (x2, y2), BOX_COLOR, 2)
+
+        # Put label text above the bounding box
+        # Ensure text background doesn't go out of frame (simple check)
+        text_y = y1 - 10 if y1 - 10 > text_height else y1 + text_height + baseline
+        cv2.rectangle(frame, (x1, text_y - text_height - baseline), (x1 + text_width, text_y), BOX_COLOR, -1) # Text background
+        cv2.putText(frame, label_with_score, (x1, text_y - baseline // 2), FONT, FONT_SCALE, TEXT_COLOR, FONT_THICKNESS)
+
+    return frame
+
+
+def _upload_batch(frames, staging: torch.Tensor, input_size, use_half: bool) -> torch.Tensor:
+    """
+    Letterboxes BGR frames into the pinned uint8 staging buffer and copies them to the GPU with a
+    non-blocking transfer. Frames go in the top-left corner and the padding (pre-filled with 114)
+    stays at the bottom/right, so predicted boxes need no offset, only inv_scale.
+
+    Returns:
+        torch.Tensor: (B, 3, MODEL_IMGSZ, MODEL_IMGSZ) RGB batch in [0, 1], as Ultralytics expects for tensors.
+    """
+    staging_np = staging.numpy() # Shares memory with the pinned tensor
+    for i, frame in enumerate(frames):
+        if input_size is not None:
+            frame = cv2.resize(frame, input_size, interpolation=cv2.INTER_LINEAR)
+        h, w = frame.shape[:2]
+        staging_np[i, :h, :w] = frame
+
+    # Upload uint8 (half the bytes of FP16) and do layout, BGR->RGB and normalization on the GPU.
+    # Each channel is copied straight into a contiguous output (TensorRT needs contiguous input), so
+    # the reorder and dtype cast are a single pass with no intermediate full-batch copies.
+    # Note: Ultralytics still copies tensor sources back to the host to build Results.orig_img.
+    batch = staging[:len(frames)].to('cuda', non_blocking=True) # BHWC, BGR
+    out = torch.empty((len(frames), 3, MODEL_IMGSZ, MODEL_IMGSZ),
+                      dtype=torch.float16 if use_half else torch.float32, device='cuda')
+    for c in range(3):
+        out[:, c].copy_(batch[..., 2 - c]) # BGR -> RGB, HWC -> CHW and uint8 -> float
+    return out.div_(255)
+
+
+def export_tensorrt_engine(model_path, engine_path, batch_size: int = 8):
+    """
+    Exports the YOLOv8 .pt model to a TensorRT engine at engine_path, if one isn't cached yet.
+    Only runs on CUDA hosts; any failure is logged and the .pt model keeps being used.
+
+    Args:
+        model_path: Path to the trained YOLOv8 model (.pt file).
+        engine_path: Path where the exported .engine file is cached (config.ENGINE_PATH, which
+            encodes batch_size so an engine built for another batch size is never reused).
+        batch_size (int): Max batch size the engine is built for (dynamic up to this value).
+    """
+    engine_path = Path(engine_path)
+    if engine_path.exists():
+        logging.info(f"Using cached TensorRT engine: {engine_path}")
+        return
+    if not torch.cuda.is_available():
+        logging.info("CUDA not available, skipping TensorRT export.")
+        return
+
+    logging.info(f"Exporting TensorRT engine from {model_path} (this can take a few minutes)...")
+    try:
+        exported = YOLO(str(model_path)).export(format='engine', half=True, dynamic=True, batch=batch_size, imgsz=MODEL_IMGSZ)
+        # Ultralytics always writes <model>.engine next to the .pt; move it to the configured path
+        Path(exported).replace(engine_path)
+        logging.info(f"TensorRT engine saved to: {engine_path}")
+    except Exception as e:
+        logging.warning(f"TensorRT export failed, falling back to PyTorch model: {e}")
+
+
+def load_model(model_path, engine_path=None):
+    """
+    Loads the YOLOv8 model once so it can be reused across videos. Prefers the TensorRT engine
+    at engine_path (see export_tensorrt_engine) when it exists and running on GPU.
+
+    Args:
+        model_path: Path to the trained YOLOv8 model (.pt file).
+        engine_path: Optional path to the exported .engine file (config.ENGINE_PATH).
+
+    Returns:
+        YOLO: The loaded model, moved to the GPU if available.
+    """
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    model_path = str(model_path)
+
+    if device == 'cuda' and engine_path is not None:
+        if Path(engine_path).exists():
+            model_path = str(engine_path)
+            logging.info(f"Found TensorRT engine, using: {model_path}")
+        else:
+            logging.info(f"No TensorRT engine at {engine_path} (run export_engine.py), using: {model_path}")
+
+    try:
+        # Load the YOLOv8 model
+        model = YOLO(model_path, task='detect')
+        if not model_path.endswith('.engine'): # Engines are bound to the GPU they were built on
+            model.to(device) # Move model to GPU if available
+        logging.info(f"Model {model_path} loaded successfully on {device}. Class names: {model.names}")
+    except Exception as e:
+        logging.error(f"Error loading YOLO model: {e}", exc_info=True)
+        raise
+
+    return model
+
+
+def warmup_model(model, batch_size: int = 1, runs: int = 2):
+    """
+    Runs a few dummy forward passes so CUDA kernels, cuDNN autotuning and TensorRT contexts
+    are initialized before the first real video, instead of stalling its first frames.
+
+    Args:
+        model (YOLO): Model returned by load_model().
+        batch_size (int): Batch size to warm up with (should match the processing batch size).
+        runs (int): Number of warm-up passes.
+    """
+    use_half = torch.cuda.is_available()
+    dummy_batch = [np.zeros((MODEL_IMGSZ, MODEL_IMGSZ, 3), dtype=np.uint8)] * batch_size
+    try:
+        for _ in range(runs):
+            model.predict(dummy_batch, half=use_half, imgsz=MODEL_IMGSZ, verbose=False)
+        logging.info(f"Model warm-up complete ({runs} runs, batch size {batch_size})")
+    except Exception as e:
+        logging.warning(f"Model warm-up failed, first video may start slowly: {e}")
+
+
+def process_video(input_video_path: str, output_video_path: str, model, prefetch: int = 8,
+                  batch_size: int = 8, detect_stride: int = 1):
     """
     Processes a video file using a YOLOv8 model to detect objects (traffic signs),
     annotates the video with bounding boxes and labels, and saves the result.
@@ -14,115 +262,195 @@ def process_video(input_video_path: str, output_video_path: str, model_path: str
     Args:
         input_video_path (str): Path to the input video file.
         output_video_path (str): Path where the processed video will be saved.
-        model_path (str): Path to the trained YOLOv8 model (.pt file).
+        model (YOLO | str): Preloaded model from load_model(), or a path to load it from.
+        prefetch (int): Max frames buffered between the reader, inference and writer stages.
+        batch_size (int): Number of frames passed to the model per predict() call.
+        detect_stride (int): Run detection on every Nth frame only and reuse the last detections
+            on the frames in between (signs move little between consecutive frames). 1 = every frame.
     """
     logging.info(f"Starting video processing for: {input_video_path}")
-    logging.info(f"Using model: {model_path}")
     logging.info(f"Output will be saved to: {output_video_path}")
 
     # Check GPU availability (optional but recommended)
     device = 'cuda' if torch.cuda.is_available() else 'cpu'
     logging.info(f"Using device: {device}")
 
-    try:
-        # Load the YOLOv8 model
-        model = YOLO(model_path)
-        model.to(device) # Move model to GPU if available
-        class_names = model.names # Get class names from the model
-        logging.info(f"Model loaded successfully. Class names: {class_names}")
+    if isinstance(model, (str, Path)):
+        model = load_model(model) # Re-raises so the error is caught by the route
+    use_half = device == 'cuda' # FP16 doubles Tensor Core throughput on GPU; it's slow/unsupported on CPU
+    class_names = model.names # Get class names from the model
+    labels = _build_labels(class_names) # Built once per video, not per box
+    logging.info(f"Half precision (FP16) inference: {use_half}")
 
+    # Open the input video file (NVDEC via PyAV on CUDA hosts, OpenCV otherwise)
+    use_hw_codec = device == 'cuda'
+    try:
+        cap = open_video_source(input_video_path, use_cuda=use_hw_codec)
     except Exception as e:
-        logging.error(f"Error loading YOLO model: {e}", exc_info=True)
-        raise  # Re-raise the exception to be caught by the route
-
-    # Open the input video file
-    cap = cv2.VideoCapture(input_video_path)
-    if not cap.isOpened():
-        logging.error(f"Error opening video file: {input_video_path}")
-        raise IOError(f"Cannot open video file: {input_video_path}")
+        logging.error(f"Error opening video file: {input_video_path}: {e}")
+        raise IOError(f"Cannot open video file: {input_video_path}") from e
 
     # Get video properties
-    frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    frame_width = cap.width
+    frame_height = cap.height
+    fps = cap.fps
+    total_frames = cap.frame_count
     logging.info(f"Video properties: {frame_width}x{frame_height} @ {fps:.2f} FPS, Total Frames: {total_frames}")
 
-    # Define the codec and create VideoWriter object
-    # Using 'mp4v' codec for MP4 output. Other options: 'XVID' for AVI
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    video_writer = cv2.VideoWriter(output_video_path, fourcc, fps, (frame_width, frame_height))
-    if not video_writer.isOpened():
-         logging.error(f"Error initializing video writer for: {output_video_path}")
-         cap.release() # Release the input video capture object
-         raise IOError(f"Cannot initialize video writer for: {output_video_path}")
+    # Per-video inference setup. Done before the writer is created and guarded so a bad video
+    # (e.g. a container reporting a 0x0 size) or a failed allocation can't leak the open containers.
+    try:
+        if frame_width <= 0 or frame_height <= 0:
+            raise IOError(f"Invalid video size {frame_width}x{frame_height}: {input_video_path}")
+
+        # Downscale frames to the model input size once here instead of letting YOLO resize full-res frames.
+        # Boxes are scaled back up when drawing on the full-resolution frame.
+        scale = MODEL_IMGSZ / max(frame_width, frame_height)
+        if scale < 1:
+            input_size = (round(frame_width * scale), round(frame_height * scale))
+            logging.info(f"Resizing frames to {input_size[0]}x{input_size[1]} before inference")
+        else:
+            scale = 1.0 # Never upscale small videos
+            input_size = None
+        inv_scale = 1.0 / scale
+
+        # On GPU, keyframes are staged in page-locked (pinned) memory so the host-to-device copy is a
+        # fast async DMA instead of a synchronous copy from pageable memory. Allocated once per video;
+        # reusing it is safe because predict() has synced on its results before the next batch is staged.
+        staging = None
+        if device == 'cuda':
+            staging = torch.full((batch_size, MODEL_IMGSZ, MODEL_IMGSZ, 3), 114, dtype=torch.uint8).pin_memory()
+    except Exception:
+        cap.release() # Release the input video capture object
+        raise
 
+    # Create the video writer (H.264 via PyAV: NVENC on CUDA hosts, libx264 ultrafast otherwise; OpenCV 'mp4v' fallback)
+    try:
+        video_writer = open_video_sink(output_video_path, fps, (frame_width, frame_height), use_cuda=use_hw_codec)
+    except Exception as e:
+         logging.error(f"Error initializing video writer for: {output_video_path}: {e}")
+         cap.release() # Release the input video capture object
+         raise IOError(f"Cannot initialize video writer for: {output_video_path}") from e
 
     logging.info("Starting frame processing loop...")
+    # Decode and encode run on their own threads so the GPU isn't idle while frames
+    # are read/written. Inference stays on this thread, so the model needs no locks.
+    read_q = queue.Queue(maxsize=prefetch)
+    write_q = queue.Queue(maxsize=prefetch)
+    stop_event = threading.Event()
+    thread_errors = {} # 'reader'/'writer' -> exception raised in that thread
+    reader = threading.Thread(target=_read_frames, args=(cap, read_q, stop_event, thread_errors),
+                              name='reader', daemon=True)
+    writer = threading.Thread(target=_write_frames, args=(video_writer, write_q, thread_errors),
+                              name='writer', daemon=True)
+    reader.start()
+    writer.start()
+
     frame_count = 0
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            logging.info("End of video reached or cannot read frame.")
-            break
+    batch = [] # Frames are accumulated and sent to the model together to amortize per-call overhead
+    frames_per_batch = batch_size * detect_stride # So each batch holds batch_size keyframes
+    last_detections = None # Detections from the most recent keyframe, reused until the next one
+    end_of_video = False
+    failed_batches = 0 # Consecutive batches whose prediction failed
+    predicted_batches = 0 # Batches whose prediction succeeded
+    try:
+        while not end_of_video:
+            frame = _get_checked(read_q, reader, thread_errors)
+            if frame is not None:
+                batch.append(frame)
+                if len(batch) < frames_per_batch:
+                    continue
+            else: # Sentinel from the reader thread; flush whatever is left in the batch
+                logging.info("End of video reached or cannot read frame.")
+                end_of_video = True
+                if not batch:
+                    break
 
-        frame_count += 1
-        if frame_count % 100 == 0: # Log progress every 100 frames
-             logging.info(f"Processing frame {frame_count}/{total_frames}")
+            prev_count = frame_count
+            frame_count += len(batch)
+            if (frame_count ^ prev_count) & -LOG_EVERY: # Log progress each time a multiple of LOG_EVERY is crossed
+                 logging.info(f"Processing frame {frame_count}/{total_frames}")
 
-        # Perform inference
-        # You might need to adjust parameters like conf, iou based on your training/notebook
+            # Only keyframes (every detect_stride-th frame of the video) go through the model,
+            # all of them in a single call
+            keyframe_indices = [i for i in range(len(batch)) if (prev_count + i) % detect_stride == 0]
+            # You might need to adjust parameters like conf, iou based on your training/notebook
+            try:
+                keyframes = [batch[i] for i in keyframe_indices]
+                # inference_mode skips autograd bookkeeping (version counters, view tracking) for the
+                # upload/normalize ops and the forward pass
+                with torch.inference_mode():
+                    if staging is not None:
+                        model_input = _upload_batch(keyframes, staging, input_size, use_half)
+                    elif input_size is not None:
+                        model_input = [cv2.resize(f, input_size, interpolation=cv2.INTER_LINEAR) for f in keyframes]
+                    else:
+                        model_input = keyframes
+                    results = []
+                    if keyframes:
+                        results = model.predict(model_input, device=device, half=use_half, imgsz=MODEL_IMGSZ, verbose=False) # verbose=False to reduce console spam
+                predicted_batches += 1
+                failed_batches = 0
+            except Exception as e:
+                failed_batches += 1
+                # A persistent error (OOM, engine/batch mismatch, ...) would otherwise produce a complete
+                # video without any boxes and a "successful" job, so give up after a few in a row
+                if failed_batches >= MAX_CONSECUTIVE_PREDICT_FAILURES:
+                    raise RuntimeError(f"Model prediction failed on {failed_batches} consecutive batches: {e}") from e
+                # Only build the traceback when debug logging is on
+                logging.warning(f"Error during model prediction on frames {prev_count + 1}-{frame_count}: {e}",
+                                exc_info=logging.getLogger().isEnabledFor(logging.DEBUG))
+                # Treat it as transient: keep the frames in the output (unannotated) so the video doesn't lose footage
+                results = []
+                last_detections = None
+
+            # Process results in frame order so the output sequence is preserved
+            keyframe_results = dict(zip(keyframe_indices, results))
+            for i, batch_frame in enumerate(batch):
+                if i in keyframe_results:
+                    last_detections = _detections_to_numpy(keyframe_results[i])
+                annotated_frame = _annotate_frame(batch_frame, last_detections, labels, inv_scale)
+
+                # Hand the annotated frame to the writer thread
+                _put_checked(write_q, annotated_frame, writer, thread_errors)
+            batch = []
+
+        if failed_batches and not predicted_batches:
+            raise RuntimeError("Model prediction failed on every batch of the video")
+    finally:
         try:
-            results = model.predict(frame, device=device, verbose=False) # verbose=False to reduce console spam
-        except Exception as e:
-            logging.error(f"Error during model prediction on frame {frame_count}: {e}", exc_info=True)
-            # Decide if you want to skip the frame or stop processing
-            continue # Skip this frame
-
-        # Process results - results[0] contains detections for the first image (frame)
-        annotated_frame = frame.copy() # Work on a copy to preserve original
-        detections = results[0].boxes.data.cpu().numpy() # Get boxes, scores, classes as numpy array
-
-        if len(detections) > 0:
-            for i, det in enumerate(detections):
-                x1, y1, x2, y2, score, class_id = det
-                x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2) # Convert coordinates to integers
-                class_id = int(class_id)
-
-                # Get class name
-                label = class_names.get(class_id, f"Class_{class_id}") # Use dictionary .get for safety
-                label_with_score = f"{label}: {score:.2f}"
-
-                # Draw bounding box
-                # You can customize color, thickness etc.
-                cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-
-                # Put label text above the bounding box
-                (text_width, text_height), baseline = cv2.getTextSize(label_with_score, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
-                # Ensure text background doesn't go out of frame (simple check)
-                text_y = y1 - 10 if y1 - 10 > text_height else y1 + text_height + baseline
-                cv2.rectangle(annotated_frame, (x1, text_y - text_height - baseline), (x1 + text_width, text_y), (0, 255, 0), -1) # Text background
-                cv2.putText(annotated_frame, label_with_score, (x1, text_y - baseline // 2), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2) # Black text
-
-
-        # Write the annotated frame to the output video
-        video_writer.write(annotated_frame)
-
-    # Release resources
-    logging.info("Finished processing all frames. Releasing resources.")
-    cap.release()
-    video_writer.release()
+            # Stop the reader (draining so it isn't stuck on a full queue) and flush the writer
+            stop_event.set()
+            while reader.is_alive():
+                try:
+                    read_q.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            reader.join()
+            _put_checked(write_q, None, writer, thread_errors)
+            writer.join()
+        finally:
+            # Release resources even if the loop or a stage thread failed, so containers get closed
+            logging.info("Releasing video resources.")
+            cap.release()
+            video_writer.release()
+
+    # A stage thread that died after the loop finished would otherwise leave a truncated output
+    if thread_errors:
+        raise thread_errors.get('reader') or thread_errors['writer']
+
     # cv2.destroyAllWindows() # Not strictly necessary in backend, but good practice
     logging.info(f"Video processing complete. Output saved to: {output_video_path}")
 
 
-# Example of how to run this script standalone (for testing)
+# Example of how to run this script standalone (for testing), from the project root:
+#   python -m app.processing.video_processor
 if __name__ == '__main__':
     # Create dummy files for testing if they don't exist
     # You should replace these with actual paths for testing
-    test_input_path = "../test_videos/sample.mp4" # Adjust path as needed
-    test_output_path = "../outputs/test_output.mp4" # Adjust path as needed
-    test_model_path = "../ml_model/best.pt" # Adjust path as needed
+    test_input_path = "test_videos/sample.mp4" # Adjust path as needed
+    test_output_path = "outputs/test_output.mp4" # Adjust path as needed
+    test_model_path = "ml_model/best.pt" # Adjust path as needed
 
     # Make sure dummy directories exist if running standalone
     import os
@@ -142,7 +470,7 @@ if __name__ == '__main__':
          print(f"ERROR: Test model file not found at {test_model_path}")
     else:
         try:
-            process_video(test_input_path, test_output_path, test_model_path)
+            process_video(test_input_path, test_output_path, load_model(test_model_path))
             print("Test processing finished successfully.")
         except Exception as e:
             print(f"Test processing failed: {e}")
\ No newline at end of file
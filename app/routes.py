@@ -4,11 +4,12 @@ import uuid # To generate unique filenames
 from flask import (
     Blueprint, # <<< Import Blueprint
     render_template, request, redirect, url_for,
-    flash, send_from_directory, current_app # Keep current_app for use *inside* functions
+    flash, send_from_directory, current_app, # Keep current_app for use *inside* functions
+    jsonify
 )
 from werkzeug.utils import secure_filename
-# Adjust the import path for video_processor relative to routes.py
-from .processing.video_processor import process_video
+# Video processing runs in a Celery worker (see tasks.py); only the light Celery app is imported here
+from .celery_app import celery, RUN_PROCESSING_TASK
 # Adjust the import path for config relative to routes.py
 from config import allowed_file
 
@@ -50,29 +51,21 @@ def index():
             output_path = current_app.config['OUTPUT_FOLDER'] / output_filename
 
             try:
-                # Save the uploaded file
-                file.save(upload_path)
+                # Save the uploaded file, copying in large chunks (the default is 16 KiB) for multi-GB videos
+                file.save(upload_path, buffer_size=current_app.config['UPLOAD_BUFFER_SIZE'])
                 flash(f'File "{original_filename}" uploaded successfully. Starting processing...', 'info')
 
                 # --- Trigger the background processing ---
-                process_video(str(upload_path), str(output_path), str(current_app.config['MODEL_PATH']))
+                # The Celery worker runs the model and deletes the upload when done; the page polls /status
+                job = celery.send_task(RUN_PROCESSING_TASK, args=[str(upload_path), str(output_path)])
+                current_app.logger.info(f"Queued processing job {job.id} for {original_filename}")
 
-                flash(f'Video processing complete for "{original_filename}".', 'success')
-
-                # Clean up the original uploaded file after processing
-                try:
-                    os.remove(upload_path)
-                except OSError as e:
-                     current_app.logger.error(f"Error deleting uploaded file {upload_path}: {e}")
-
-
-                # Use url_for with the blueprint name: 'main.download_file'
-                return render_template('results.html', output_filename=output_filename)
+                return render_template('processing.html', job_id=job.id, original_filename=original_filename)
 
             except Exception as e:
                 # Use current_app.logger inside the function
-                current_app.logger.error(f"Error processing file {original_filename}: {e}", exc_info=True)
-                flash(f'An error occurred during processing: {str(e)}', 'danger')
+                current_app.logger.error(f"Error queueing file {original_filename}: {e}", exc_info=True)
+                flash(f'An error occurred while starting processing: {str(e)}', 'danger')
                 # Clean up potentially partially saved files
                 if os.path.exists(upload_path): # Check existence before removing
                     try:
@@ -99,6 +92,35 @@ def index():
     return render_template('index.html')
 
 
+# --- Job status and results routes, polled by processing.html ---
+@bp.route('/status/<job_id>')
+def job_status(job_id):
+    result = celery.AsyncResult(job_id)
+    response = {'state': result.state}
+    if result.successful():
+        response['results_url'] = url_for('main.results', filename=result.result)
+    elif result.failed():
+        response['error'] = str(result.result)
+    return jsonify(response)
+
+
+@bp.route('/results/<filename>')
+def results(filename):
+    safe_filename = secure_filename(filename)
+    if not safe_filename == filename:
+        flash('Invalid filename.', 'danger')
+        return redirect(url_for('main.index'))
+
+    # Only claim success for outputs a job actually produced
+    file_path = os.path.join(current_app.config['OUTPUT_FOLDER'], safe_filename)
+    if not os.path.exists(file_path):
+        flash(f'File not found: {safe_filename}', 'danger')
+        return redirect(url_for('main.index'))
+
+    flash('Video processing complete.', 'success')
+    return render_template('results.html', output_filename=safe_filename)
+
+
 # --- Define download route using the blueprint ---
 @bp.route('/download/<filename>')
 def download_file(filename):
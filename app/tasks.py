@@ -0,0 +1,60 @@
+# app/tasks.py
+# Background video processing with Celery (Redis broker), so uploads don't block a web worker.
+# Build the TensorRT engine once before starting the worker (it can take minutes):
+#   python export_engine.py
+# then start a single GPU worker so the CUDA context isn't shared across forks:
+#   celery -A app.tasks worker --concurrency=1 --loglevel=info
+import os
+import logging
+from celery.signals import worker_process_init
+import config
+from .celery_app import celery, RUN_PROCESSING_TASK
+from .processing.video_processor import load_model, warmup_model, process_video
+
+_model = None # Loaded once per worker process and reused for every job
+
+
+def get_model():
+    """Returns this worker's YOLO model, loading and warming it up if preload_model hasn't already."""
+    global _model
+    if _model is None:
+        # Uses the TensorRT engine from export_engine.py when present, otherwise the .pt model
+        _model = load_model(config.MODEL_PATH, config.ENGINE_PATH)
+        warmup_model(_model, config.BATCH_SIZE)
+    return _model
+
+
+@worker_process_init.connect
+def preload_model(**kwargs):
+    # Load in the worker child (after fork) so the first job doesn't pay the load + warm-up cost.
+    # worker_proc_alive_timeout in celery_app.py gives this time to finish before the child must report ready.
+    get_model()
+
+
+@celery.task(name=RUN_PROCESSING_TASK)
+def run_processing(upload_path: str, output_path: str):
+    """
+    Runs process_video on an uploaded file and removes the upload afterwards.
+
+    Returns:
+        str: The output filename, used by the status endpoint to build the download link.
+    """
+    try:
+        process_video(upload_path, output_path, get_model(), batch_size=config.BATCH_SIZE,
+                      detect_stride=config.DETECT_STRIDE)
+    except Exception:
+        # Clean up a partially written output so it can't be downloaded
+        if os.path.exists(output_path):
+            try:
+                os.remove(output_path)
+            except OSError as e_del_out:
+                logging.error(f"Error deleting output file on error {output_path}: {e_del_out}")
+        raise
+    finally:
+        # Clean up the original uploaded file after processing
+        try:
+            os.remove(upload_path)
+        except OSError as e:
+            logging.error(f"Error deleting uploaded file {upload_path}: {e}")
+
+    return os.path.basename(output_path)
@@ -1,5 +1,6 @@
 # config.py
 import os
+import re
 from pathlib import Path
 
 # Get the absolute path of the project's root directory
@@ -14,6 +15,27 @@ MODEL_PATH = BASE_DIR / 'ml_model' / 'best.pt' # Path to your YOLOv8 model
 UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
 OUTPUT_FOLDER.mkdir(parents=True, exist_ok=True)
 
+# Number of frames sent to the model per inference call (larger batches use more GPU memory)
+BATCH_SIZE = int(os.environ.get('BATCH_SIZE', 8))
+
+# TensorRT engine exported from MODEL_PATH on CUDA hosts (see export_engine.py). Its dynamic batch
+# profile is capped at BATCH_SIZE, so the batch size is part of the name: changing BATCH_SIZE points
+# at a different file and the .pt model is used until the engine is re-exported.
+ENGINE_PATH = MODEL_PATH.with_name(f'{MODEL_PATH.stem}_b{BATCH_SIZE}.engine')
+
+# Run detection on every Nth frame and reuse those boxes on the frames in between (1 = every frame)
+DETECT_STRIDE = int(os.environ.get('DETECT_STRIDE', 3))
+
+# Celery broker/result backend for background video processing (see app/tasks.py)
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', CELERY_BROKER_URL)
+
+# Chunk size used when copying uploads to disk; large sequential writes suit multi-GB videos
+UPLOAD_BUFFER_SIZE = 4 * 1024 * 1024 # 4 MiB
+
+# Seconds a Celery worker child may spend loading/warming up the model before it must report ready
+WORKER_STARTUP_TIMEOUT = float(os.environ.get('WORKER_STARTUP_TIMEOUT', 300))
+
 # Allowed video extensions (adjust if needed)
 ALLOWED_EXTENSIONS = {'mp4', 'avi', 'mov', 'mkv'}
 
@@ -24,7 +46,9 @@ SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-replace-me')
 # Debug mode (set to False in production)
 DEBUG = True
 
+# Compiled once from ALLOWED_EXTENSIONS (which is still used for the error message)
+ALLOWED_FILE_RE = re.compile(r'.+\.(?:%s)\Z' % '|'.join(sorted(ALLOWED_EXTENSIONS)), re.IGNORECASE | re.DOTALL)
+
 # Function to check allowed file extensions
 def allowed_file(filename):
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
\ No newline at end of file
+    return ALLOWED_FILE_RE.match(filename) is not None
\ No newline at end of file
@@ -0,0 +1,9 @@
+# export_engine.py
+# Builds the TensorRT engine for the YOLO model once, before starting the Celery worker:
+#   python export_engine.py
+# The export can take several minutes; it is skipped if the engine already exists or CUDA is unavailable.
+import config
+from app.processing.video_processor import export_tensorrt_engine
+
+if __name__ == '__main__':
+    export_tensorrt_engine(config.MODEL_PATH, config.ENGINE_PATH, config.BATCH_SIZE)
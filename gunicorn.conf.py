@@ -0,0 +1,11 @@
+# gunicorn.conf.py
+# Production WSGI server settings, used by: gunicorn -c gunicorn.conf.py run:app
+# The web workers only handle uploads, status polling and downloads; the GPU work runs in a
+# single Celery worker (see app/tasks.py) so the CUDA context isn't shared across forks.
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+worker_class = 'gthread' # Threads let one worker overlap several slow uploads/downloads
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = 0 # Large video uploads can take longer than the default 30s worker timeout
@@ -1,10 +1,22 @@
 # run.py
+# Serve with gunicorn instead of Flask's single-threaded dev server:
+#   gunicorn -c gunicorn.conf.py run:app
+# and start the GPU worker separately:
+#   python export_engine.py
+#   celery -A app.tasks worker --concurrency=1 --loglevel=info
+import os
+import shutil
+import sys
+
+if __name__ == '__main__':
+    # `python run.py` is kept as a shortcut for the gunicorn command above. Exec before building
+    # the app, since gunicorn imports run:app (and creates the app) itself.
+    gunicorn = shutil.which('gunicorn')
+    if gunicorn is None:
+        sys.exit("gunicorn not found on PATH. Install the requirements with: pip install -r requirements.txt")
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    os.execv(gunicorn, [gunicorn, '--chdir', base_dir, '-c', os.path.join(base_dir, 'gunicorn.conf.py'), 'run:app'])
+
 from app import create_app
-import config
 
 app = create_app()
-
-if __name__ == '__main__':
-    # Make sure the host is accessible if running in Docker or VM
-    app.run(host='0.0.0.0', port=5000, debug=config.DEBUG)
-    
\ No newline at end of file